@@ -1,36 +1,94 @@
 #!/usr/bin/env python3
+import functools
+import io
 import os
-import shutil
+import string
+import tarfile
+import time
 
+from . import _uring_backend
 
-def _make_docker_compose_file(project_path: str, mongodb_port: int = 27017, http_port: int = 8080,
-                              express_port: int = 8081):
+
+# The templates shipped with the package, resolved once. They never
+# change at runtime, so their contents can be safely memoized.
+_DEFAULT_TEMPLATES = {
+    "default:simple": os.path.join(os.path.dirname(__file__), "templates",
+                                   "simple-application-template.py"),
+    "default:multichar": os.path.join(os.path.dirname(__file__), "templates",
+                                      "multichar-application-template.py"),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _load_template(path: str) -> bytes:
     """
-    Dumps the whole docker-compose.yml file in the project directory.
-    :param project_path: The path of the project.
-    :param mongodb_port: The mongodb port to expose the container at.
-    :param http_port: The http port to expose the container at.
-    :param express_port: The mongo express port to expose the container at.
+    Loads, and memoizes, the contents of a template file.
+    :param path: The path of the template file.
+    :returns: The template contents.
     """
 
-    contents = f"""version: '3.7'
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# Pre-encoded contents for the files that are byte-identical on every
+# generation, so no per-call string building or encoding is needed.
+_COMPOSE_SHELLSCRIPT_BYTES = b"""#!/bin/bash
+DIR="$(dirname "$0")"
+(cd "$DIR" && docker-compose $@)
+"""
+
+_REQUIREMENTS_BYTES = b"""# Place any requirements you need in this file.
+alephvault-http-mongodb-storage==0.0.10
+"""
+
+_DOCKERFILE_BYTES = b"""FROM tecktron/python-waitress:python-3.7
+
+COPY ./ /app
+RUN pip install -r /app/requirements.txt
+# The /app/app.py file will be the entrypoint for waitress serve.
+"""
+
+_INIT_BYTES = b""
+
+_CONSOLE_STARTUP_BYTES = b"""# These variables are initialized into the interpreter.
+import os
+from urllib.parse import quote_plus
+
+from pymongo import MongoClient
+
+host = os.environ["DB_HOST"].strip()
+port = os.environ["DB_PORT"]
+user = os.environ["DB_USER"].strip()
+password = os.environ["DB_PASS"]
+client = MongoClient("mongodb://%s:%s@%s:%s" % (quote_plus(user), quote_plus(password), host, port))
+"""
+
+_CONSOLE_SHELLSCRIPT_BYTES = b"""#!/bin/bash
+DIR="$(dirname "$0")"
+(cd "$DIR" && docker-compose exec -ti -e PYTHONSTARTUP="/app/http_storage_console.py" http python)
+"""
+
+# Precompiled skeletons for the parametric files, so each call only
+# substitutes the varying fields into an already-parsed structure.
+_DOCKER_COMPOSE_TEMPLATE = string.Template("""version: '3.7'
 services:
   express:
     image: mongo-express:1.0.0-alpha
     restart: always
     env_file: .env
     ports:
-      - {express_port}:8081
+      - ${express_port}:8081
     expose:
-      - {express_port}
+      - ${express_port}
   mongodb:
     image: mongo:6.0
     restart: always
     env_file: .env
     ports:
-      - {mongodb_port}:27017
+      - ${mongodb_port}:27017
     expose:
-      - {mongodb_port}
+      - ${mongodb_port}
     volumes:
       - .tmp/mongo:/data/db
   http:
@@ -40,158 +98,148 @@ services:
     restart: always
     env_file: .env
     ports:
-      - {http_port}:80
+      - ${http_port}:80
     expose:
-      - {http_port}
-"""
+      - ${http_port}
+""")
 
-    with open(os.path.join(project_path, "docker-compose.yml"), "w") as f:
-        f.write(contents)
+_ENV_TEMPLATE = string.Template("""# These environment variables stand for all the containers
+MONGO_INITDB_ROOT_USERNAME=${mongodb_user}
+MONGO_INITDB_ROOT_PASSWORD=${mongodb_pass}
+DB_HOST=mongodb
+DB_PORT=27017
+DB_USER=${mongodb_user}
+DB_PASS=${mongodb_pass}
+ME_CONFIG_MONGODB_SERVER=mongodb
+ME_CONFIG_MONGODB_PORT=27017
+ME_CONFIG_MONGODB_ADMINUSERNAME=${mongodb_user}
+ME_CONFIG_MONGODB_ADMINPASSWORD=${mongodb_pass}
+SERVER_API_KEY=${server_api_key}
+""")
 
 
-def _make_compose_shellscript_file(project_path: str):
+def _make_docker_compose_file(mongodb_port: int = 27017, http_port: int = 8080,
+                              express_port: int = 8081):
     """
-    Creates the docker-compose execution shellscript file.
-    :param project_path: The path of the project.
+    Builds the whole docker-compose.yml file contents.
+    :param mongodb_port: The mongodb port to expose the container at.
+    :param http_port: The http port to expose the container at.
+    :param express_port: The mongo express port to expose the container at.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""#!/bin/bash
-DIR="$(dirname "$0")"
-(cd "$DIR" && docker-compose $@)
-"""
+    contents = _DOCKER_COMPOSE_TEMPLATE.substitute(mongodb_port=mongodb_port, http_port=http_port,
+                                                   express_port=express_port)
+    return contents.encode("utf-8"), 0o644
 
-    filepath = os.path.join(project_path, "compose.sh")
-    with open(filepath, "w") as f:
-        f.write(contents)
-    os.chmod(filepath, 0o700)
 
+def _make_compose_shellscript_file():
+    """
+    Builds the docker-compose execution shellscript file contents.
+    :returns: The (contents, mode) entry.
+    """
+
+    return _COMPOSE_SHELLSCRIPT_BYTES, 0o700
 
-def _make_env_file(project_path: str, mongodb_user: str = "admin", mongodb_pass: str = "p455w0rd",
+
+def _make_env_file(mongodb_user: str = "admin", mongodb_pass: str = "p455w0rd",
                    server_api_key: str = "sample-abcdef"):
     """
-    Creates the envfile for the mongodb container.
-    :param project_path: The path of the project.
-    :param mongodb_port: The mongodb port to expose the container at.
+    Builds the envfile contents for the mongodb container.
     :param mongodb_user: The mongodb user.
     :param mongodb_pass: The mongodb password.
     :param server_api_key: The default api key available for a server.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""# These environment variables stand for all the containers
-MONGO_INITDB_ROOT_USERNAME={mongodb_user}
-MONGO_INITDB_ROOT_PASSWORD={mongodb_pass}
-DB_HOST=mongodb
-DB_PORT=27017
-DB_USER={mongodb_user}
-DB_PASS={mongodb_pass}
-ME_CONFIG_MONGODB_SERVER=mongodb
-ME_CONFIG_MONGODB_PORT=27017
-ME_CONFIG_MONGODB_ADMINUSERNAME={mongodb_user}
-ME_CONFIG_MONGODB_ADMINPASSWORD={mongodb_pass}
-SERVER_API_KEY={server_api_key}
-"""
-
-    with open(os.path.join(project_path, ".env"), "w") as f:
-        f.write(contents)
+    contents = _ENV_TEMPLATE.substitute(mongodb_user=mongodb_user, mongodb_pass=mongodb_pass,
+                                        server_api_key=server_api_key)
+    return contents.encode("utf-8"), 0o644
 
 
-def _make_requirements_file(project_path: str):
+def _make_requirements_file():
     """
-    Creates the requirements.txt file.
-    :param project_path: The path of the project.
+    Builds the requirements.txt file contents.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""# Place any requirements you need in this file.
-alephvault-http-mongodb-storage==0.0.10
-"""
-
-    with open(os.path.join(project_path, "server", "requirements.txt"), "w") as f:
-        f.write(contents)
+    return _REQUIREMENTS_BYTES, 0o644
 
 
-def _make_dockerfile(project_path: str):
+def _make_dockerfile():
     """
-    Creates the dockerfile.
-    :param project_path: The path of the project.
+    Builds the dockerfile contents.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""FROM tecktron/python-waitress:python-3.7
-
-COPY ./ /app
-RUN pip install -r /app/requirements.txt
-# The /app/app.py file will be the entrypoint for waitress serve.
-"""
-
-    with open(os.path.join(project_path, "server", "Dockerfile"), "w") as f:
-        f.write(contents)
+    return _DOCKERFILE_BYTES, 0o644
 
 
-def _make_init_file(project_path: str):
+def _make_init_file():
     """
-    Creates the __init__.py file.
-    :param project_path: The path of the project.
+    Builds the __init__.py file contents.
+    :returns: The (contents, mode) entry.
     """
 
-    with open(os.path.join(project_path, "server", "__init__.py"), "w") as f:
-        f.write("")
+    return _INIT_BYTES, 0o644
 
 
-def _make_console_startup_file(project_path: str):
+def _make_console_startup_file():
     """
-    Creates the http_storage_console file.
-    :param project_path: The path of the project.
+    Builds the http_storage_console file contents.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""# These variables are initialized into the interpreter.
-import os
-from urllib.parse import quote_plus
-
-from pymongo import MongoClient
-
-host = os.environ["DB_HOST"].strip()
-port = os.environ["DB_PORT"]
-user = os.environ["DB_USER"].strip()
-password = os.environ["DB_PASS"]
-client = MongoClient("mongodb://%s:%s@%s:%s" % (quote_plus(user), quote_plus(password), host, port))
-"""
-
-    with open(os.path.join(project_path, "server", "http_storage_console.py"), "w") as f:
-        f.write(contents)
+    return _CONSOLE_STARTUP_BYTES, 0o644
 
 
-def _make_console_shellscript_file(project_path: str):
+def _make_console_shellscript_file():
     """
-    Creates the console execution shellscript file.
-    :param project_path: The path of the project.
+    Builds the console execution shellscript file contents.
+    :returns: The (contents, mode) entry.
     """
 
-    contents = f"""#!/bin/bash
-DIR="$(dirname "$0")"
-(cd "$DIR" && docker-compose exec -ti -e PYTHONSTARTUP="/app/http_storage_console.py" http python)
-"""
+    return _CONSOLE_SHELLSCRIPT_BYTES, 0o700
 
-    filepath = os.path.join(project_path, "server", "console.sh")
-    with open(filepath, "w") as f:
-        f.write(contents)
-    os.chmod(filepath, 0o700)
 
+def _write_files_tar(full_path: str, entries):
+    """
+    Writes all the entries by aggregating them into a single in-memory
+    tar stream and extracting it in one shot, so the kernel receives
+    one bulk of data and metadata operations instead of a file-per-file
+    open/write/chmod dance.
+    :param full_path: The path of the project.
+    :param entries: The (path, contents, mode) entries to write.
+    """
 
-def _make_app_file(project_path: str, template: str):
+    buffer = io.BytesIO()
+    now = time.time()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for path, contents, mode in entries:
+            info = tarfile.TarInfo(os.path.relpath(path, full_path))
+            info.size = len(contents)
+            info.mode = mode
+            # TarInfo defaults mtime to the epoch, and extractall
+            # applies it; the files must get the generation time.
+            info.mtime = now
+            tar.addfile(info, io.BytesIO(contents))
+    buffer.seek(0)
+    with tarfile.open(fileobj=buffer, mode="r") as tar:
+        tar.extractall(full_path)
+
+
+def _make_app_file(template: str):
     """
-    Creates the app file, based on a template. This can occur in two ways:
+    Builds the app file contents, based on a template. This can occur
+    in two ways:
     - default:{simple|multiple}.
     - A path to a file (absolute, or relative).
-    :param project_path: The path of the project.
     :param template: The template to use.
+    :returns: The (contents, mode) entry.
     """
 
-    if template == "default:simple":
-        template = os.path.join(os.path.dirname(__file__), "templates", "simple-application-template.py")
-    elif template == "default:multichar":
-        template = os.path.join(os.path.dirname(__file__), "templates", "multichar-application-template.py")
-
-    target = os.path.join(project_path, "server", "app.py")
-    shutil.copy(template, target)
+    template = _DEFAULT_TEMPLATES.get(template, template)
+    return _load_template(template), 0o644
 
 
 def generate_project(full_path: str, template: str,
@@ -213,20 +261,49 @@ def generate_project(full_path: str, template: str,
     # Create the whole directory path, if not exists.
     os.makedirs(full_path, exist_ok=True)
 
-    # Require the directory to be empty beforehand.
-    if len(os.listdir(full_path)) != 0:
-        raise OSError("Directory not empty")
-
-    # Create the server path.
-    os.makedirs(os.path.join(full_path, "server"), exist_ok=True)
-
-    # Create all the files.
-    _make_docker_compose_file(full_path, mongodb_port, http_port, express_port)
-    _make_compose_shellscript_file(full_path)
-    _make_env_file(full_path, mongodb_user, mongodb_pass, server_api_key)
-    _make_dockerfile(full_path)
-    _make_requirements_file(full_path)
-    _make_init_file(full_path)
-    _make_app_file(full_path, template)
-    _make_console_startup_file(full_path)
-    _make_console_shellscript_file(full_path)
+    # Require the directory to be empty beforehand. scandir is used
+    # instead of listdir to stop at the first entry, rather than
+    # materializing the whole listing just to test emptiness.
+    with os.scandir(full_path) as it:
+        if next(it, None) is not None:
+            raise OSError("Directory not empty")
+
+    # Create the server path. A plain mkdir is enough: the parent
+    # exists already and the emptiness check above guarantees the
+    # server directory does not.
+    server_dir = os.path.join(full_path, "server")
+    os.mkdir(server_dir)
+
+    # Build all the files' entries, with every final path computed
+    # once up front.
+    entries = [
+        (os.path.join(full_path, "docker-compose.yml"),
+         *_make_docker_compose_file(mongodb_port, http_port, express_port)),
+        (os.path.join(full_path, "compose.sh"), *_make_compose_shellscript_file()),
+        (os.path.join(full_path, ".env"), *_make_env_file(mongodb_user, mongodb_pass, server_api_key)),
+        (os.path.join(server_dir, "Dockerfile"), *_make_dockerfile()),
+        (os.path.join(server_dir, "requirements.txt"), *_make_requirements_file()),
+        (os.path.join(server_dir, "__init__.py"), *_make_init_file()),
+        (os.path.join(server_dir, "http_storage_console.py"), *_make_console_startup_file()),
+        (os.path.join(server_dir, "console.sh"), *_make_console_shellscript_file()),
+        (os.path.join(server_dir, "app.py"), *_make_app_file(template)),
+    ]
+
+    # Write them all in a single io_uring submission, falling back to
+    # a single aggregated tar extraction when io_uring is not available
+    # (e.g. kernel older than 5.6, non-Linux platform, or liburing not
+    # installed).
+    if not _uring_backend.write_files(entries):
+        _write_files_tar(full_path, entries)
+
+    # A single durability barrier per directory: the new entries are
+    # made durable with one fsync each, which is far cheaper than any
+    # per-file fsync. File data itself still follows the kernel's
+    # normal writeback.
+    if hasattr(os, "O_DIRECTORY"):
+        for directory in (full_path, server_dir):
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
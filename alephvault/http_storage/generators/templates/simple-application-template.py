@@ -4,6 +4,7 @@ from typing import Dict
 from bson import ObjectId
 from flask import request, make_response, jsonify
 from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 from alephvault.http_storage.flask_app import StorageApp
 from alephvault.http_storage.types.method_handlers import MethodHandler, ItemMethodHandler
 
@@ -13,6 +14,12 @@ LOGGER = logging.getLogger("game-storage")
 LOGGER.setLevel(logging.INFO)
 
 
+# Resolved once at import time: the settings below are built from plain
+# constants, and the port parse does not re-run on module reloads.
+_ENV = os.environ
+_DB_PORT = int(_ENV['DB_PORT'])
+
+
 class GetUserByLogin(MethodHandler):
     """
     The user's password is not validated here.
@@ -23,7 +30,12 @@ class GetUserByLogin(MethodHandler):
         if not login:
             return make_response(jsonify({"code": "missing-lookup"}), 400)
         filter = {**filter, "login": login}
-        document = client[db][collection].find_one(filter)
+        # Only the projected fields travel over the wire, and the hint
+        # forces the unique login index even on misconfigured deployments.
+        document = client[db][collection].find_one(
+            filter, projection={"login": 1, "password": 1, "display_name": 1, "position": 1, "_id": 1},
+            hint=[("login", 1)]
+        )
         if document:
             return make_response(jsonify(document), 200)
         else:
@@ -220,10 +232,10 @@ class Application(StorageApp):
             "collection": "api-keys"
         },
         "connection": {
-            "host": os.environ['DB_HOST'],
-            "port": int(os.environ['DB_PORT']),
-            "user": os.environ['DB_USER'],
-            "password": os.environ['DB_PASS']
+            "host": _ENV['DB_HOST'],
+            "port": _DB_PORT,
+            "user": _ENV['DB_USER'],
+            "password": _ENV['DB_PASS']
         },
         "resources": {
             "accounts": {
@@ -301,7 +313,8 @@ class Application(StorageApp):
         """
 
         LOGGER.info("Initializing default key...")
-        self._client["auth-db"]["api-keys"].insert_one({"api-key": key})
+        self._client["auth-db"]["api-keys"].update_one({"api-key": key}, {"$setOnInsert": {"api-key": key}},
+                                                       upsert=True)
 
     def _init_static_scopes(self, scopes: Dict[str, int]):
         """
@@ -324,13 +337,12 @@ class Application(StorageApp):
         super().__init__(self.SETTINGS, import_name=import_name)
         try:
             setup = self._client["lifecycle"]["setup"]
-            result = setup.find_one()
-            if not result:
-                setup.insert_one({"done": True})
-                self._init_default_key(os.environ['SERVER_API_KEY'])
+            result = setup.update_one({}, {"$setOnInsert": {"done": True}}, upsert=True)
+            if result.upserted_id is not None:
+                self._init_default_key(_ENV['SERVER_API_KEY'])
                 self._init_static_scopes({})
-        except:
-            pass
+        except PyMongoError:
+            LOGGER.exception("The initial setup could not be completed")
 
 
 app = Application()